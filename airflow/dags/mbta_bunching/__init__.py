@@ -1 +1 @@
-__all__ = ["config", "ingest_vehicles"]
\ No newline at end of file
+__all__ = ["config", "ingest_vehicles", "tasks"]
\ No newline at end of file
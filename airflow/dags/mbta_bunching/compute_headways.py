@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 
@@ -9,7 +9,9 @@ from .config import (
     SILVER_VEHICLES_DIR,
     GOLD_GAPS_DIR,
     GOLD_SCORES_DIR,
+    HEADWAY_ENGINE,
 )
+from .headway_engines import get_engine
 
 SILVER_DIR = Path(SILVER_VEHICLES_DIR)
 GAPS_DIR = Path(GOLD_GAPS_DIR)
@@ -49,66 +51,31 @@ def _load_expected_headways() -> pd.DataFrame:
     return df
 
 
-def compute_headways_for_snapshot(silver_path: str) -> tuple[Path, Path]:
+def compute_headways_for_snapshot(
+    silver_path: str, engine: Optional[str] = None
+) -> tuple[Path, Path]:
     """
     Given a Silver vehicles CSV, compute:
       - headway gaps (Gold, per stop/bus sequence)
       - headway scores (Gold, per route/direction)
 
+    engine selects the dataframe backend (see headway_engines.ENGINES);
+    defaults to config.HEADWAY_ENGINE.
+
     Returns:
         (gaps_path, scores_path)
     """
     silver_path = Path(silver_path)
-    df = pd.read_csv(silver_path)
-
-    df["updated_at"] = pd.to_datetime(df["updated_at"], utc=True, errors="coerce")
-
-    df = df.sort_values(
-        ["route_id", "direction_id", "trip_id", "current_stop_sequence", "updated_at"]
-    )
-
-    gaps_df = (
-        df[["route_id", "direction_id", "updated_at"]]
-        .dropna(subset=["route_id", "direction_id", "updated_at"])
-        .copy()
-    )
-
-    gaps_df["gap_min"] = (
-        gaps_df.groupby(["route_id", "direction_id"])["updated_at"]
-        .diff()
-        .dt.total_seconds()
-        / 60.0
-    )
-
-    gaps_df = gaps_df.dropna(subset=["gap_min"])
+    compute = get_engine(engine or HEADWAY_ENGINE)
 
     tag = silver_path.stem.split("_")[-1]
     gaps_path = GAPS_DIR / f"headway_gaps_{tag}.csv"
-    GAPS_DIR.mkdir(parents=True, exist_ok=True)
-    gaps_df.to_csv(gaps_path, index=False)
-
-    scores_df = (
-        gaps_df.groupby(["route_id", "direction_id"])
-        .agg(
-            median=("gap_min", "median"),
-            mean=("gap_min", "mean"),
-            std=("gap_min", "std"),
-            count=("gap_min", "count"),
-        )
-        .reset_index()
-    )
-
-    scores_df["expected_headway_min"] = 10.0
-
-    scores_df["headway_health_score"] = (
-        (scores_df["mean"] - scores_df["expected_headway_min"]).abs()
-        + scores_df["std"].fillna(0)
-    ) / scores_df["expected_headway_min"]
-
     scores_path = SCORES_DIR / f"headway_scores_{tag}.csv"
+    GAPS_DIR.mkdir(parents=True, exist_ok=True)
     SCORES_DIR.mkdir(parents=True, exist_ok=True)
-    scores_df.to_csv(scores_path, index=False)
+
+    compute([silver_path], gaps_path, scores_path)
 
     print(f"[Gold] Wrote gaps to {gaps_path}")
     print(f"[Gold] Wrote scores to {scores_path}")
-    return gaps_path, scores_path
\ No newline at end of file
+    return gaps_path, scores_path
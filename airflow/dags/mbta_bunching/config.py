@@ -12,5 +12,32 @@ BRONZE_VEHICLES_DIR = os.path.join(DATA_DIR, "bronze", "vehicles_raw")
 SILVER_VEHICLES_DIR = os.path.join(DATA_DIR, "silver", "vehicles")
 GOLD_GAPS_DIR = os.path.join(DATA_DIR, "gold", "headway_gaps")
 GOLD_SCORES_DIR = os.path.join(DATA_DIR, "gold", "headway_scores")
+GOLD_TILES_DIR = os.path.join(DATA_DIR, "gold", "tiles")
+GOLD_TILE_HISTORY_DIR = os.path.join(DATA_DIR, "gold", "tile_history")
 
 RAW_DATA_DIR = BRONZE_VEHICLES_DIR
+
+# Dataframe backend for the Gold step: "pandas" (reference) or "polars".
+HEADWAY_ENGINE = os.getenv("HEADWAY_ENGINE", "pandas")
+
+# Opt-in task profiling: "all" or a comma list of task callables, e.g.
+# "run_ingestion,compute_gold_from_latest_silver". See profiling.py.
+PROFILE_TASKS = os.getenv("MBTA_PROFILE_TASKS", "")
+PROFILE_DIR = os.getenv("MBTA_PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+PROFILE_SAMPLE_INTERVAL_S = float(os.getenv("MBTA_PROFILE_SAMPLE_INTERVAL_S", "0.005"))
+
+# Spatial tile pyramid published for the dashboard map (see publish_tiles.py).
+TILE_MIN_ZOOM = int(os.getenv("MBTA_TILE_MIN_ZOOM", "10"))
+TILE_MAX_ZOOM = int(os.getenv("MBTA_TILE_MAX_ZOOM", "15"))
+# The map accumulates this many snapshots (672 = one week of 15-minute runs).
+TILE_HISTORY_SNAPSHOTS = int(os.getenv("MBTA_TILE_HISTORY_SNAPSHOTS", "672"))
+
+# Bunching thresholds.
+# Within one snapshot: consecutive buses on a route/direction at most this
+# many stops apart (by current_stop_sequence) count as bunched. Used by the
+# tile map and worst_routes_by_hour in notebook/headway_sql.py.
+BUNCHING_STOP_SPACING = int(os.getenv("MBTA_BUNCHING_STOP_SPACING", "1"))
+# Across snapshots: successive trips reaching the same stop less than this
+# many minutes apart count as bunched. Used by gap_distribution_per_stop in
+# notebook/headway_sql.py.
+BUNCHING_GAP_MIN = float(os.getenv("MBTA_BUNCHING_GAP_MIN", "2.0"))
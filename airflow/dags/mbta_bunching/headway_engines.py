@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence
+
+import pandas as pd
+
+# Every engine takes one or more Silver CSVs and writes the two Gold CSVs.
+# Outputs must be byte-for-byte identical across engines, so the column
+# order, sort keys and CSV formatting below are part of the contract.
+HeadwayEngine = Callable[[Sequence[Path], Path, Path], None]
+
+SORT_KEYS = ["route_id", "direction_id", "trip_id", "current_stop_sequence", "updated_at"]
+GROUP_KEYS = ["route_id", "direction_id"]
+GAPS_COLUMNS = ["route_id", "direction_id", "updated_at", "gap_min"]
+SCORES_COLUMNS = [
+    "route_id",
+    "direction_id",
+    "median",
+    "mean",
+    "std",
+    "count",
+    "expected_headway_min",
+    "headway_health_score",
+]
+EXPECTED_HEADWAY_MIN = 10.0
+
+# IDs are read as strings by every engine so that sorting does not depend on
+# whether a given file happens to contain only numeric routes/trips.
+ID_COLUMNS = ["route_id", "trip_id"]
+# Numeric keys are pinned to float so a snapshot without nulls still writes
+# direction_id as "0.0" (pandas would otherwise infer int and write "0").
+FLOAT_COLUMNS = ["direction_id", "current_stop_sequence"]
+SILVER_DTYPES = {
+    **{c: str for c in ID_COLUMNS},
+    **{c: float for c in FLOAT_COLUMNS},
+}
+
+
+def compute_with_pandas(
+    silver_paths: Sequence[Path], gaps_path: Path, scores_path: Path
+) -> None:
+    """Reference implementation (single-threaded pandas)."""
+    df = pd.concat(
+        [
+            pd.read_csv(p, dtype=SILVER_DTYPES)
+            for p in silver_paths
+        ],
+        ignore_index=True,
+    )
+
+    # ISO8601 rather than inferring one format from the first row, which
+    # would silently NaT any file/day written with fractional seconds.
+    df["updated_at"] = pd.to_datetime(
+        df["updated_at"], utc=True, errors="coerce", format="ISO8601"
+    )
+
+    df = df.sort_values(SORT_KEYS)
+
+    gaps_df = (
+        df[["route_id", "direction_id", "updated_at"]]
+        .dropna(subset=["route_id", "direction_id", "updated_at"])
+        .copy()
+    )
+
+    gaps_df["gap_min"] = (
+        gaps_df.groupby(GROUP_KEYS)["updated_at"]
+        .diff()
+        .dt.total_seconds()
+        / 60.0
+    )
+
+    gaps_df = gaps_df.dropna(subset=["gap_min"])
+    gaps_df.to_csv(gaps_path, index=False)
+
+    scores_df = (
+        gaps_df.groupby(GROUP_KEYS)
+        .agg(
+            median=("gap_min", "median"),
+            mean=("gap_min", "mean"),
+            std=("gap_min", "std"),
+            count=("gap_min", "count"),
+        )
+        .reset_index()
+    )
+
+    scores_df["expected_headway_min"] = EXPECTED_HEADWAY_MIN
+
+    scores_df["headway_health_score"] = (
+        (scores_df["mean"] - scores_df["expected_headway_min"]).abs()
+        + scores_df["std"].fillna(0)
+    ) / scores_df["expected_headway_min"]
+
+    scores_df.to_csv(scores_path, index=False)
+
+
+def _pandas_timestamp_strings(pl: Any, updated_at: Any) -> Any:
+    """
+    Render tz-aware timestamps the way pandas' to_csv does, row by row:
+    no fraction for whole seconds, 6 digits for microseconds and 9 when
+    there are nanoseconds.
+    """
+    fraction_ns = updated_at.dt.nanosecond()
+    base = "%Y-%m-%d %H:%M:%S"
+    return (
+        pl.when(fraction_ns == 0)
+        .then(updated_at.dt.to_string(f"{base}%:z"))
+        .when(fraction_ns % 1000 == 0)
+        .then(updated_at.dt.to_string(f"{base}%.6f%:z"))
+        .otherwise(updated_at.dt.to_string(f"{base}%.9f%:z"))
+    )
+
+
+def compute_with_polars(
+    silver_paths: Sequence[Path], gaps_path: Path, scores_path: Path
+) -> None:
+    """
+    Multithreaded implementation on Polars' lazy engine.
+
+    Polars sizes its thread pool to all available cores; set
+    POLARS_MAX_THREADS to cap it.
+    """
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "HEADWAY_ENGINE=polars requires the 'polars' package "
+            "(add it to _PIP_ADDITIONAL_REQUIREMENTS)."
+        ) from e
+
+    lf = pl.scan_csv(
+        [str(p) for p in silver_paths],
+        schema_overrides={
+            "route_id": pl.String,
+            "trip_id": pl.String,
+            "direction_id": pl.Float64,
+            "current_stop_sequence": pl.Float64,
+            "updated_at": pl.String,
+        },
+    )
+
+    gaps_df = (
+        lf.select(SORT_KEYS)
+        .with_columns(
+            pl.col("updated_at").str.to_datetime(
+                time_unit="ns", time_zone="UTC", strict=False
+            )
+        )
+        .sort(SORT_KEYS, nulls_last=True, maintain_order=True)
+        .drop_nulls(["route_id", "direction_id", "updated_at"])
+        .with_columns(
+            pl.col("updated_at")
+            .diff()
+            .over(GROUP_KEYS)
+            .dt.total_nanoseconds()
+            .alias("gap_ns")
+        )
+        .drop_nulls(["gap_ns"])
+        .collect()
+    )
+
+    # Polars' scalar division and median interpolation can differ from pandas
+    # in the last bit, so the final float arithmetic is done in numpy.
+    gap_ns = gaps_df["gap_ns"].to_numpy()
+    gaps_df = gaps_df.with_columns(
+        pl.Series("gap_min", gap_ns / 1e9 / 60.0)
+    ).select(GAPS_COLUMNS)
+
+    scores_df = (
+        gaps_df.lazy()
+        .group_by(GROUP_KEYS)
+        .agg(
+            pl.col("gap_min").sort().get((pl.len() - 1) // 2).alias("median_lo"),
+            pl.col("gap_min").sort().get(pl.len() // 2).alias("median_hi"),
+            pl.col("gap_min").mean().alias("mean"),
+            pl.col("gap_min").std().fill_nan(None).alias("std"),
+            pl.col("gap_min").count().alias("count"),
+        )
+        .sort(GROUP_KEYS)
+        .collect()
+    )
+    mean = scores_df["mean"].to_numpy()
+    std = scores_df["std"].fill_null(0).to_numpy()
+    median = (scores_df["median_lo"].to_numpy() + scores_df["median_hi"].to_numpy()) / 2
+    scores_df = scores_df.with_columns(
+        pl.Series("median", median),
+        pl.lit(EXPECTED_HEADWAY_MIN).alias("expected_headway_min"),
+        pl.Series(
+            "headway_health_score",
+            (abs(mean - EXPECTED_HEADWAY_MIN) + std) / EXPECTED_HEADWAY_MIN,
+        ),
+    ).select(SCORES_COLUMNS)
+
+    gaps_df.with_columns(
+        _pandas_timestamp_strings(pl, pl.col("updated_at")).alias("updated_at")
+    ).write_csv(gaps_path)
+    scores_df.write_csv(scores_path)
+
+
+ENGINES: Dict[str, HeadwayEngine] = {
+    "pandas": compute_with_pandas,
+    "polars": compute_with_polars,
+}
+
+
+def get_engine(name: str) -> HeadwayEngine:
+    """Look up a Gold engine by name (see config.HEADWAY_ENGINE)."""
+    try:
+        return ENGINES[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown headway engine {name!r}; expected one of {sorted(ENGINES)}"
+        ) from None
@@ -12,7 +12,8 @@ from .config import (
     MBTA_API_KEY,
     BRONZE_VEHICLES_DIR,
 )
-from .pipeline_io import _ensure_dir, _clean_dir
+from .io_utils import _ensure_dir, _clean_dir
+from .profiling import profiled
 
 
 def build_vehicles_url(
@@ -83,6 +84,7 @@ def save_snapshot(payload: Dict[str, Any], routes_label: str) -> str:
     return str(out_path)
 
 
+@profiled
 def run_ingestion(routes: Optional[List[str]] = None, **_: Any) -> str:
     """
     Entry-point used by Airflow's PythonOperator.
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+# Kept free of third-party imports so light tasks (e.g. ingestion) can use
+# these helpers without pulling in pandas.
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create directory (and parents) if it does not exist."""
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _clean_dir(path: Path, pattern: str) -> None:
+    """
+    Delete all files matching pattern in the given directory.
+
+    Examples
+    --------
+    _clean_dir(SILVER_DIR, "*.csv")
+    _clean_dir(GAPS_DIR, "*.csv")
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    for f in path.glob(pattern):
+        try:
+            f.unlink()
+        except OSError:
+            pass
+
+
+def _keep_latest(path: Path, pattern: str, keep: int) -> None:
+    """
+    Delete all but the `keep` latest (by name sort) files matching pattern.
+
+    Examples
+    --------
+    _keep_latest(TILE_HISTORY_DIR, "tile_partial_*.csv", 672)
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    files = sorted(path.glob(pattern))
+    for f in files[: max(len(files) - keep, 0)]:
+        try:
+            f.unlink()
+        except OSError:
+            pass
+
+
+def _latest_file(directory: Path, suffix: str) -> Path:
+    """Return the latest file (by name sort) with the given suffix in directory."""
+    _ensure_dir(directory)
+    files = sorted(directory.glob(f"*{suffix}"))
+    if not files:
+        raise FileNotFoundError(f"No *{suffix} files found in {directory}")
+    return files[-1]
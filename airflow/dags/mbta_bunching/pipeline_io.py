@@ -13,6 +13,8 @@ from .config import (
     GOLD_SCORES_DIR,
 )
 from .compute_headways import compute_headways_for_snapshot
+from .io_utils import _ensure_dir, _clean_dir, _latest_file
+from .profiling import profiled
 
 BRONZE_DIR = Path(BRONZE_VEHICLES_DIR)
 SILVER_DIR = Path(SILVER_VEHICLES_DIR)
@@ -20,39 +22,7 @@ GAPS_DIR = Path(GOLD_GAPS_DIR)
 SCORES_DIR = Path(GOLD_SCORES_DIR)
 
 
-def _ensure_dir(path: Path) -> None:
-    """Create directory (and parents) if it does not exist."""
-    path.mkdir(parents=True, exist_ok=True)
-
-
-def _clean_dir(path: Path, pattern: str) -> None:
-    """
-    Delete all files matching pattern in the given directory.
-
-    Examples
-    --------
-    _clean_dir(SILVER_DIR, "*.csv")
-    _clean_dir(GAPS_DIR, "*.csv")
-    """
-    path = Path(path)
-    if not path.exists():
-        return
-    for f in path.glob(pattern):
-        try:
-            f.unlink()
-        except OSError:
-            pass
-
-
-def _latest_file(directory: Path, suffix: str) -> Path:
-    """Return the latest file (by name sort) with the given suffix in directory."""
-    _ensure_dir(directory)
-    files = sorted(directory.glob(f"*{suffix}"))
-    if not files:
-        raise FileNotFoundError(f"No *{suffix} files found in {directory}")
-    return files[-1]
-
-
+@profiled
 def transform_latest_snapshot_to_silver(**_: Any) -> str:
     """
     Read latest raw JSON snapshot from Bronze and write a flat vehicles CSV to Silver.
@@ -113,6 +83,7 @@ def transform_latest_snapshot_to_silver(**_: Any) -> str:
     return str(silver_path)
 
 
+@profiled
 def compute_gold_from_latest_silver(**_: Any) -> str:
     """
     Read latest Silver vehicles CSV and compute headway gaps + scores into Gold.
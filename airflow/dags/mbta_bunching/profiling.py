@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .config import PROFILE_DIR, PROFILE_TASKS, PROFILE_SAMPLE_INTERVAL_S
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TOP_N = 30
+
+
+def _profiling_enabled(name: str, params: Optional[Dict[str, Any]]) -> bool:
+    """
+    Profiling is opt-in, per task:
+
+    - env MBTA_PROFILE_TASKS="all" or a comma list of callable names
+    - DAG param "profile": true (all tasks) or a list of callable names,
+      e.g. trigger with conf {"profile": ["compute_gold_from_latest_silver"]}
+    """
+    wanted = {t.strip() for t in PROFILE_TASKS.split(",") if t.strip()}
+    if "all" in wanted or name in wanted:
+        return True
+
+    # Only a real boolean or a list enables it: conf values like "false"
+    # or 0 must not switch profiling on.
+    flag = (params or {}).get("profile")
+    if isinstance(flag, (list, tuple, set)):
+        return name in flag
+    return flag is True
+
+
+class _StackSampler(threading.Thread):
+    """
+    Sample one thread's Python stack at a fixed interval and count
+    collapsed stacks ("outer;inner;leaf"), i.e. flamegraph.pl input.
+    """
+
+    def __init__(self, target_ident: int, interval: float) -> None:
+        super().__init__(name="mbta-profile-sampler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _snapshot_tag(result: Any) -> str:
+    """Tasks return the path they wrote; its stem ends with the snapshot tag."""
+    if isinstance(result, (str, Path)):
+        return Path(result).stem.split("_")[-1]
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+
+
+def _write_artifacts(
+    name: str,
+    tag: str,
+    wall_s: float,
+    profiler: cProfile.Profile,
+    sampler: _StackSampler,
+    mem_snapshot: tracemalloc.Snapshot,
+    peak_bytes: int,
+) -> Path:
+    out_dir = Path(PROFILE_DIR) / tag
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(str(out_dir / f"{name}.prof"))
+
+    collapsed = out_dir / f"{name}.collapsed.txt"
+    with collapsed.open("w", encoding="utf-8") as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    buf = io.StringIO()
+    buf.write(f"task        : {name}\n")
+    buf.write(f"snapshot    : {tag}\n")
+    buf.write(f"wall time   : {wall_s:.3f} s\n")
+    buf.write(f"peak memory : {peak_bytes / 1024 / 1024:.1f} MiB (tracemalloc)\n")
+    buf.write(f"samples     : {sum(sampler.stacks.values())}\n\n")
+
+    buf.write(f"=== Top {TOP_N} functions by cumulative time (cProfile) ===\n")
+    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(TOP_N)
+
+    buf.write(f"=== Top {TOP_N} allocation sites (tracemalloc) ===\n")
+    for stat in mem_snapshot.statistics("lineno")[:TOP_N]:
+        buf.write(f"{stat}\n")
+
+    summary = out_dir / f"{name}.summary.txt"
+    summary.write_text(buf.getvalue(), encoding="utf-8")
+    return out_dir
+
+
+def profiled(func: F) -> F:
+    """
+    Wrap a pipeline task so that, when enabled, it captures:
+
+      <PROFILE_DIR>/<snapshot tag>/<task>.prof            cProfile stats
+      <PROFILE_DIR>/<snapshot tag>/<task>.collapsed.txt   sampled stacks
+      <PROFILE_DIR>/<snapshot tag>/<task>.summary.txt     text report
+
+    When disabled the task runs untouched.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _profiling_enabled(name, kwargs.get("params")):
+            return func(*args, **kwargs)
+
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_S)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        sampler.start()
+        profiler.enable()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            profiler.disable()
+            sampler.stop()
+            wall_s = time.perf_counter() - start
+            mem_snapshot = tracemalloc.take_snapshot()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            if not already_tracing:
+                tracemalloc.stop()
+
+            # Written even if the task raised: failures are what we most
+            # want to look at. Without a result, the tag is the current time.
+            try:
+                out_dir = _write_artifacts(
+                    name,
+                    _snapshot_tag(result),
+                    wall_s,
+                    profiler,
+                    sampler,
+                    mem_snapshot,
+                    peak_bytes,
+                )
+            except OSError as e:
+                # Never let profiling mask the task's own result or error.
+                print(f"[Profile] Could not write {name} profile: {e}")
+            else:
+                print(f"[Profile] Wrote {name} profile to {out_dir}")
+
+    return wrapper  # type: ignore[return-value]
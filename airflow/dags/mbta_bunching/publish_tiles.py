@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    SILVER_VEHICLES_DIR,
+    GOLD_TILES_DIR,
+    GOLD_TILE_HISTORY_DIR,
+    TILE_MIN_ZOOM,
+    TILE_MAX_ZOOM,
+    TILE_HISTORY_SNAPSHOTS,
+    BUNCHING_STOP_SPACING,
+)
+from .headway_engines import GROUP_KEYS, SILVER_DTYPES
+from .io_utils import _ensure_dir, _keep_latest, _latest_file
+
+SILVER_DIR = Path(SILVER_VEHICLES_DIR)
+TILES_DIR = Path(GOLD_TILES_DIR)
+HISTORY_DIR = Path(GOLD_TILE_HISTORY_DIR)
+
+# Each tile also carries a CELL_BITS x CELL_BITS sub-grid (i.e. tiles at
+# zoom z + CELL_BITS) so the map can draw a heatmap finer than the tile.
+CELL_BITS = 3
+MAX_LAT = 85.05112878
+
+# Per-snapshot partials are binned on the finest cell grid; every tile and
+# cell of the pyramid is a right shift of it.
+GRID_ZOOM = TILE_MAX_ZOOM + CELL_BITS
+PARTIAL_COLUMNS = [
+    "zoom",
+    "gx",
+    "gy",
+    "route_id",
+    "vehicles",
+    "bunching_events",
+    "spacing_sum",
+    "spacing_count",
+]
+SUM_COLUMNS = ["vehicles", "bunching_events", "spacing_sum", "spacing_count"]
+
+
+def _tile_xy(lat: np.ndarray, lon: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+    """Web Mercator (slippy map) tile indices for each position at zoom."""
+    n = 2 ** zoom
+    lat_rad = np.radians(np.clip(lat, -MAX_LAT, MAX_LAT))
+    x = np.floor((lon + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * n)
+    return (
+        np.clip(x, 0, n - 1).astype(np.int64),
+        np.clip(y, 0, n - 1).astype(np.int64),
+    )
+
+
+def quadkey(x: int, y: int, zoom: int) -> str:
+    """Bing-style quadkey for tile (x, y) at zoom."""
+    digits = []
+    for i in range(zoom, 0, -1):
+        mask = 1 << (i - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def _positions_with_spacing(silver_path: Path) -> pd.DataFrame:
+    """
+    Silver positions with the spacing, in stops, to the next vehicle behind
+    on the same route/direction, keeping lat/lon so spacing and bunching
+    can be placed on the map.
+
+    A snapshot holds one position per vehicle, so spacing along
+    current_stop_sequence is the headway it can measure. Pairs at most
+    BUNCHING_STOP_SPACING stops apart count as one bunching event, placed
+    at the leading vehicle. Vehicles without a route/direction/sequence
+    still count towards the tile but have no spacing.
+    """
+    df = pd.read_csv(silver_path, dtype=SILVER_DTYPES)
+
+    spacing_keys = GROUP_KEYS + ["current_stop_sequence"]
+    has_keys = df[spacing_keys].notna().all(axis=1)
+    ordered = df[has_keys].sort_values(
+        spacing_keys + ["vehicle_id"], kind="mergesort"
+    )
+    df["spacing_stops"] = np.nan
+    df.loc[ordered.index, "spacing_stops"] = ordered.groupby(GROUP_KEYS)[
+        "current_stop_sequence"
+    ].diff()
+    df["bunched"] = df["spacing_stops"] <= BUNCHING_STOP_SPACING
+
+    df = df.dropna(subset=["latitude", "longitude"])
+    df["route_id"] = df["route_id"].fillna("unknown")
+    return df[["route_id", "latitude", "longitude", "spacing_stops", "bunched"]]
+
+
+def snapshot_partial(silver_path: Path) -> pd.DataFrame:
+    """
+    One snapshot reduced to sums per (finest grid cell, route): vehicles,
+    bunching events and spacing sum/count. Partials from any number of
+    snapshots add up to the history the pyramid is built from.
+    """
+    df = _positions_with_spacing(silver_path)
+    gx, gy = _tile_xy(
+        df["latitude"].to_numpy(dtype=float),
+        df["longitude"].to_numpy(dtype=float),
+        GRID_ZOOM,
+    )
+    return (
+        df.assign(gx=gx, gy=gy, has_spacing=df["spacing_stops"].notna())
+        .groupby(["gx", "gy", "route_id"])
+        .agg(
+            vehicles=("bunched", "size"),
+            bunching_events=("bunched", "sum"),
+            spacing_sum=("spacing_stops", "sum"),
+            spacing_count=("has_spacing", "sum"),
+        )
+        .reset_index()
+        .assign(zoom=GRID_ZOOM)[PARTIAL_COLUMNS]
+    )
+
+
+def _read_partials(partial_paths: Sequence[Path]) -> pd.DataFrame:
+    df = pd.concat(
+        [pd.read_csv(p, dtype={"route_id": str}) for p in partial_paths],
+        ignore_index=True,
+    )
+    # Partials written before TILE_MAX_ZOOM changed sit on another grid.
+    stale = df["zoom"] != GRID_ZOOM
+    if stale.any():
+        print(f"[Tiles] Skipping {int(stale.sum())} partial rows binned at another zoom")
+    return df[~stale]
+
+
+def _tile_payload(
+    zoom: int,
+    x: int,
+    y: int,
+    by_route: pd.DataFrame,
+    cells: pd.DataFrame,
+) -> Dict[str, Any]:
+    routes = {
+        str(r.route_id): {
+            "vehicles": int(r.vehicles),
+            "bunching_events": int(r.bunching_events),
+            "mean_spacing_stops": (
+                round(float(r.spacing_sum / r.spacing_count), 2) if r.spacing_count else None
+            ),
+        }
+        for r in by_route.itertuples(index=False)
+    }
+    return {
+        "z": zoom,
+        "x": x,
+        "y": y,
+        "quadkey": quadkey(x, y, zoom),
+        "vehicles": int(by_route["vehicles"].sum()),
+        "bunching_events": int(by_route["bunching_events"].sum()),
+        "routes": routes,
+        # [cell_x, cell_y, vehicles, bunching_events] within a 2^CELL_BITS grid
+        "cells": cells[["cx", "cy", "vehicles", "bunching_events"]].astype(int).values.tolist(),
+    }
+
+
+def build_tile_pyramid(partial_paths: Sequence[Path], out_dir: Path) -> Dict[str, Any]:
+    """
+    Add up per-snapshot partials (see snapshot_partial) and bin them into
+    {z}/{x}/{y}.json tiles for TILE_MIN_ZOOM..TILE_MAX_ZOOM under out_dir.
+
+    Returns the index listing which tiles exist at each zoom; writing it is
+    left to the caller so a new pyramid can be published atomically.
+    """
+    df = _read_partials(partial_paths)
+    gx = df["gx"].to_numpy(dtype=np.int64)
+    gy = df["gy"].to_numpy(dtype=np.int64)
+
+    tags = [Path(p).stem.split("_")[-1] for p in partial_paths]
+    index: Dict[str, Any] = {
+        "tag": tags[-1],
+        "first_tag": tags[0],
+        "snapshots": len(tags),
+        "min_zoom": TILE_MIN_ZOOM,
+        "max_zoom": TILE_MAX_ZOOM,
+        "cell_bits": CELL_BITS,
+        "tiles": {},
+    }
+
+    cell_mask = (1 << CELL_BITS) - 1
+    for zoom in range(TILE_MIN_ZOOM, TILE_MAX_ZOOM + 1):
+        shift = GRID_ZOOM - zoom
+        binned = df.assign(
+            x=gx >> shift,
+            y=gy >> shift,
+            cx=(gx >> (shift - CELL_BITS)) & cell_mask,
+            cy=(gy >> (shift - CELL_BITS)) & cell_mask,
+        )
+
+        by_route = binned.groupby(["x", "y", "route_id"])[SUM_COLUMNS].sum().reset_index()
+        cells = (
+            binned.groupby(["x", "y", "cx", "cy"])[["vehicles", "bunching_events"]]
+            .sum()
+            .reset_index()
+        )
+        cells_by_tile = dict(tuple(cells.groupby(["x", "y"])))
+
+        keys = []
+        for (x, y), tile_routes in by_route.groupby(["x", "y"]):
+            x, y = int(x), int(y)
+            payload = _tile_payload(zoom, x, y, tile_routes, cells_by_tile[(x, y)])
+            tile_path = out_dir / str(zoom) / str(x) / f"{y}.json"
+            _ensure_dir(tile_path.parent)
+            tile_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            keys.append(f"{x}/{y}")
+
+        index["tiles"][str(zoom)] = keys
+
+    return index
+
+
+def _current_version(tiles_dir: Path) -> Optional[str]:
+    try:
+        return json.loads((tiles_dir / "index.json").read_text(encoding="utf-8")).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _new_version(tiles_dir: Path, tag: str) -> str:
+    """The snapshot tag, suffixed if that tag was already published (a rerun)."""
+    version, n = tag, 0
+    while (tiles_dir / version).exists():
+        n += 1
+        version = f"{tag}-{n}"
+    return version
+
+
+def publish_tiles_from_latest_silver(**_: Any) -> str:
+    """
+    Add the latest Silver snapshot to the tile history and publish the
+    spatial tile pyramid over the last TILE_HISTORY_SNAPSHOTS snapshots.
+
+    Each snapshot is kept as a small partial aggregate in HISTORY_DIR (Silver
+    itself only holds the latest snapshot). Every pyramid is written to its
+    own TILES_DIR/<version>/ directory, and index.json is then replaced
+    atomically to point at it, so readers never see a partial tree. The
+    previous version is kept for clients still holding the old index.
+
+    Returns
+    -------
+    str
+        Path to the tiles index.json.
+    """
+    latest_silver = _latest_file(SILVER_DIR, ".csv")
+    tag = latest_silver.stem.split("_")[-1]
+
+    _ensure_dir(HISTORY_DIR)
+    snapshot_partial(latest_silver).to_csv(HISTORY_DIR / f"tile_partial_{tag}.csv", index=False)
+    _keep_latest(HISTORY_DIR, "tile_partial_*.csv", TILE_HISTORY_SNAPSHOTS)
+    partials = sorted(HISTORY_DIR.glob("tile_partial_*.csv"))
+
+    _ensure_dir(TILES_DIR)
+    previous = _current_version(TILES_DIR)
+    version = _new_version(TILES_DIR, tag)
+    staging = TILES_DIR / f".{version}.tmp"
+    if staging.exists():
+        shutil.rmtree(staging)
+    index = build_tile_pyramid(partials, staging)
+    index["version"] = version
+    os.rename(staging, TILES_DIR / version)
+
+    index_path = TILES_DIR / "index.json"
+    tmp_index = TILES_DIR / ".index.json.tmp"
+    tmp_index.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_index, index_path)
+
+    for old in TILES_DIR.iterdir():
+        if old.is_dir() and not old.name.startswith(".") and old.name not in (version, previous):
+            shutil.rmtree(old, ignore_errors=True)
+
+    n_tiles = sum(len(v) for v in index["tiles"].values())
+    print(
+        f"[Tiles] Wrote {n_tiles} tiles (z{TILE_MIN_ZOOM}-{TILE_MAX_ZOOM}) over "
+        f"{index['snapshots']} snapshots to {TILES_DIR / version}"
+    )
+    return str(index_path)
@@ -0,0 +1,34 @@
+"""
+Airflow entry points for the MBTA bunching DAG.
+
+The scheduler re-imports the DAG file every few seconds, and the DAG file
+imports only this module. Keep it free of heavy imports (pandas, requests,
+polars, ...): each callable imports its implementation when the task runs.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+
+def run_ingestion(routes: Optional[List[str]] = None, **context: Any) -> str:
+    from .ingest_vehicles import run_ingestion as _run_ingestion
+
+    return _run_ingestion(routes, **context)
+
+
+def transform_latest_snapshot_to_silver(**context: Any) -> str:
+    from .pipeline_io import transform_latest_snapshot_to_silver as _to_silver
+
+    return _to_silver(**context)
+
+
+def compute_gold_from_latest_silver(**context: Any) -> str:
+    from .pipeline_io import compute_gold_from_latest_silver as _to_gold
+
+    return _to_gold(**context)
+
+
+def publish_tiles_from_latest_silver(**context: Any) -> str:
+    from .publish_tiles import publish_tiles_from_latest_silver as _to_tiles
+
+    return _to_tiles(**context)
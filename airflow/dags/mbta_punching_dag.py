@@ -5,10 +5,13 @@ from datetime import datetime, timedelta
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 
-from mbta_bunching.ingest_vehicles import run_ingestion
-from mbta_bunching.pipeline_io import (
+# Only the lightweight entry points are imported here: this file is parsed by
+# the scheduler in a loop, so pandas/requests are loaded inside the tasks.
+from mbta_bunching.tasks import (
+    run_ingestion,
     transform_latest_snapshot_to_silver,
     compute_gold_from_latest_silver,
+    publish_tiles_from_latest_silver,
 )
 
 default_args = {
@@ -24,6 +27,9 @@ with DAG(
     schedule_interval="*/15 * * * *",  # every 15 minutes
     catchup=False,
     description="End-to-end MBTA bus bunching pipeline (Bronze → Silver → Gold)",
+    # Trigger with conf {"profile": true} (or a list of task callables) to
+    # capture cProfile/tracemalloc artifacts under data/profiles/<tag>/.
+    params={"profile": False},
 ) as dag:
 
     ingest = PythonOperator(
@@ -42,4 +48,9 @@ with DAG(
         python_callable=compute_gold_from_latest_silver,
     )
 
-    ingest >> to_silver >> to_gold
\ No newline at end of file
+    to_tiles = PythonOperator(
+        task_id="publish_map_tiles",
+        python_callable=publish_tiles_from_latest_silver,
+    )
+
+    ingest >> to_silver >> [to_gold, to_tiles]
\ No newline at end of file
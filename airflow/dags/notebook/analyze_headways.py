@@ -28,3 +28,8 @@ print("Raw Bronze shape:", df_raw.shape)
 silver = pd.read_csv(latest_silver)
 scores = pd.read_csv(latest_scores)
 gaps   = pd.read_csv(latest_gaps)
+
+# For queries across many snapshots without loading them into memory, use the
+# DuckDB views in headway_sql.py instead, e.g.:
+#   from headway_sql import connect, worst_routes_by_hour
+#   worst_routes_by_hour(connect("20251201", "20251207"))
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+import pandas as pd
+
+# parents[0] = notebook, parents[1] = dags
+DAGS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(DAGS_DIR))
+
+from mbta_bunching.config import BUNCHING_GAP_MIN, BUNCHING_STOP_SPACING  # noqa: E402
+
+BASE = DAGS_DIR / "data"
+
+LAYERS = {
+    # view name -> (directory, glob, pinned CSV column types)
+    "bronze_vehicles": (BASE / "bronze" / "vehicles_raw", "*.json", {}),
+    "silver_vehicles": (
+        BASE / "silver" / "vehicles",
+        "vehicles_*.csv",
+        {
+            "vehicle_id": "VARCHAR",
+            "route_id": "VARCHAR",
+            "trip_id": "VARCHAR",
+            "stop_id": "VARCHAR",
+            "updated_at": "TIMESTAMPTZ",
+        },
+    ),
+    "gold_gaps": (
+        BASE / "gold" / "headway_gaps",
+        "headway_gaps_*.csv",
+        {"route_id": "VARCHAR", "updated_at": "TIMESTAMPTZ"},
+    ),
+    "gold_scores": (
+        BASE / "gold" / "headway_scores",
+        "headway_scores_*.csv",
+        {"route_id": "VARCHAR"},
+    ),
+}
+
+LOCAL_TZ = "America/New_York"
+
+TAG_RE = re.compile(r"_(\d{8}T\d{6}Z)\.\w+$")
+TAG_SQL = r"regexp_extract(filename, '_(\d{8}T\d{6}Z)\.\w+$', 1)"
+
+
+def _files_in_range(
+    directory: Path,
+    pattern: str,
+    start: Optional[str],
+    end: Optional[str],
+) -> List[str]:
+    """
+    Partition pruning on the snapshot tag in each filename.
+
+    start/end are tag prefixes, e.g. "20251201" or "20251209T13"; both are
+    inclusive. Files outside the range are never opened.
+    """
+    files = []
+    for f in sorted(directory.glob(pattern)):
+        m = TAG_RE.search(f.name)
+        if not m:
+            continue
+        tag = m.group(1)
+        if start and tag < start:
+            continue
+        if end and tag[: len(end)] > end:
+            continue
+        files.append(str(f))
+    return files
+
+
+def _sql_list(files: List[str]) -> str:
+    return "[" + ", ".join("'" + f.replace("'", "''") + "'" for f in files) + "]"
+
+
+def _view_sql(name: str, files: List[str], types: Dict[str, str]) -> str:
+    if name == "bronze_vehicles":
+        return f"""
+            SELECT
+                {TAG_SQL} AS snapshot_tag,
+                v.id AS vehicle_id,
+                v.relationships.route.data.id AS route_id,
+                v.relationships.trip.data.id AS trip_id,
+                v.relationships.stop.data.id AS stop_id,
+                v.attributes.direction_id AS direction_id,
+                v.attributes.current_status AS current_status,
+                v.attributes.current_stop_sequence AS current_stop_sequence,
+                v.attributes.label AS label,
+                v.attributes.latitude AS latitude,
+                v.attributes.longitude AS longitude,
+                v.attributes.speed AS speed,
+                v.attributes.bearing AS bearing,
+                v.attributes.occupancy_status AS occupancy_status,
+                CAST(v.attributes.updated_at AS TIMESTAMPTZ) AS updated_at
+            FROM (
+                SELECT filename, unnest(data) AS v
+                FROM read_json(
+                    {_sql_list(files)},
+                    filename = true,
+                    maximum_object_size = 268435456
+                )
+            )
+        """
+    return f"""
+        SELECT {TAG_SQL} AS snapshot_tag, * EXCLUDE (filename)
+        FROM read_csv(
+            {_sql_list(files)},
+            filename = true,
+            union_by_name = true,
+            types = {{{", ".join(f"'{k}': '{v}'" for k, v in types.items())}}}
+        )
+    """
+
+
+def connect(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    database: str = ":memory:",
+) -> duckdb.DuckDBPyConnection:
+    """
+    Open an embedded DuckDB session with one lazy view per layer:
+
+        bronze_vehicles, silver_vehicles, gold_gaps, gold_scores
+
+    Views are only definitions over the stored files: nothing is loaded
+    until a query runs, and DuckDB then reads just the columns the query
+    touches and applies filters inside the scan. start/end restrict which
+    snapshot files the views cover (see _files_in_range).
+
+    Layers with no files in range are skipped.
+    """
+    con = duckdb.connect(database)
+    for name, (directory, pattern, types) in LAYERS.items():
+        files = _files_in_range(directory, pattern, start, end)
+        if not files:
+            print(f"[sql] no files for {name} in {directory}", file=sys.stderr)
+            continue
+        con.execute(f"CREATE OR REPLACE VIEW {name} AS {_view_sql(name, files, types)}")
+    return con
+
+
+def worst_routes_by_hour(
+    con: duckdb.DuckDBPyConnection,
+    limit: int = 20,
+) -> pd.DataFrame:
+    """
+    Route/direction/hour-of-day buckets ranked by share of bunched vehicle
+    pairs, then by spacing variability.
+
+    Within each snapshot, vehicles on a route/direction are ordered by
+    current_stop_sequence and each is compared with the one ahead of it;
+    pairs at most BUNCHING_STOP_SPACING stops apart count as bunched. This
+    works on a single snapshot, unlike time apart at the same stop.
+    """
+    return con.execute(
+        f"""
+        WITH spacing AS (
+            SELECT
+                route_id,
+                direction_id,
+                updated_at,
+                current_stop_sequence - lag(current_stop_sequence) OVER (
+                    PARTITION BY snapshot_tag, route_id, direction_id
+                    ORDER BY current_stop_sequence, vehicle_id
+                ) AS spacing_stops
+            FROM silver_vehicles
+            WHERE route_id IS NOT NULL
+              AND direction_id IS NOT NULL
+              AND current_stop_sequence IS NOT NULL
+        )
+        SELECT
+            route_id,
+            direction_id,
+            hour(timezone('{LOCAL_TZ}', updated_at)) AS hour_local,
+            count(*) AS n_pairs,
+            avg(CAST(spacing_stops <= $bunching AS DOUBLE)) AS bunched_share,
+            median(spacing_stops) AS median_spacing_stops,
+            stddev_samp(spacing_stops) AS std_spacing_stops
+        FROM spacing
+        WHERE spacing_stops IS NOT NULL
+          AND updated_at IS NOT NULL
+        GROUP BY ALL
+        HAVING count(*) >= 3
+        ORDER BY bunched_share DESC, std_spacing_stops DESC NULLS LAST
+        LIMIT $limit
+        """,
+        {"bunching": BUNCHING_STOP_SPACING, "limit": limit},
+    ).df()
+
+
+def gap_distribution_per_stop(
+    con: duckdb.DuckDBPyConnection,
+    route_id: Optional[str] = None,
+    bucket_min: float = 2.0,
+) -> pd.DataFrame:
+    """
+    Histogram of headways between successive trips at each stop (same
+    route/direction), from Silver positions.
+
+    Each trip is first reduced to the earliest time it was seen at a stop,
+    which keeps the window small and stops repeated pings of one bus from
+    counting as zero-minute gaps.
+    """
+    return con.execute(
+        """
+        WITH arrivals AS (
+            SELECT route_id, direction_id, stop_id, trip_id, min(updated_at) AS arrived_at
+            FROM silver_vehicles
+            WHERE stop_id IS NOT NULL
+              AND direction_id IS NOT NULL
+              AND trip_id IS NOT NULL
+              AND updated_at IS NOT NULL
+              AND ($route_id IS NULL OR route_id = $route_id)
+            GROUP BY ALL
+        ),
+        stop_headways AS (
+            SELECT
+                route_id,
+                direction_id,
+                stop_id,
+                arrived_at,
+                date_diff('second',
+                    lag(arrived_at) OVER (
+                        PARTITION BY route_id, direction_id, stop_id
+                        ORDER BY arrived_at, trip_id
+                    ),
+                    arrived_at
+                ) / 60.0 AS gap_min
+            FROM arrivals
+        )
+        SELECT
+            route_id,
+            direction_id,
+            stop_id,
+            floor(gap_min / $bucket) * $bucket AS gap_bucket_min,
+            count(*) AS n_gaps,
+            avg(CAST(gap_min < $bunching AS DOUBLE)) AS bunched_share
+        FROM stop_headways
+        WHERE gap_min IS NOT NULL
+        GROUP BY ALL
+        ORDER BY route_id, direction_id, stop_id, gap_bucket_min
+        """,
+        {
+            "route_id": route_id,
+            "bucket": bucket_min,
+            "bunching": BUNCHING_GAP_MIN,
+        },
+    ).df()
+
+
+def main() -> None:
+    """
+    Usage:
+        python headway_sql.py [START [END]]        # canned reports
+        python headway_sql.py --sql "SELECT ..."   # ad-hoc query
+    """
+    args = sys.argv[1:]
+    if args[:1] == ["--sql"]:
+        con = connect()
+        print(con.sql(" ".join(args[1:])))
+        return
+
+    start = args[0] if len(args) > 0 else None
+    end = args[1] if len(args) > 1 else None
+    con = connect(start, end)
+
+    views = {
+        r[0] for r in con.execute("SELECT view_name FROM duckdb_views() WHERE NOT internal").fetchall()
+    }
+
+    if "silver_vehicles" not in views:
+        return
+    print("=== Worst route/direction by hour (local) ===")
+    print(worst_routes_by_hour(con).to_string(index=False))
+    print()
+    print("=== Gap distribution per stop ===")
+    print(gap_distribution_per_stop(con).head(40).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
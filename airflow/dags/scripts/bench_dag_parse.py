@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# parents[0] = scripts, parents[1] = dags
+DAGS_DIR = Path(__file__).resolve().parents[1]
+DAG_FILE = DAGS_DIR / "mbta_punching_dag.py"
+
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+TASKS_IMPORT_BUDGET_MS = float(os.getenv("MBTA_TASKS_IMPORT_BUDGET_MS", "50"))
+DAG_PARSE_BUDGET_MS = float(os.getenv("MBTA_DAG_PARSE_BUDGET_MS", "250"))
+
+# Must never be imported while the scheduler parses the DAG.
+HEAVY_MODULES = ["pandas", "numpy", "requests", "polars", "duckdb", "pyarrow"]
+
+# Each probe runs in a fresh interpreter so nothing is already cached in
+# sys.modules. Anything in `warmup` is imported first and not timed: Airflow
+# itself is already loaded in the scheduler's parsing processes.
+PROBE = """
+import importlib.util, json, sys, time
+for name in {warmup!r}:
+    __import__(name)
+before = set(sys.modules)
+start = time.perf_counter()
+{stmt}
+elapsed_ms = (time.perf_counter() - start) * 1000
+loaded = set(sys.modules) - before
+heavy = sorted(m for m in {heavy!r} if m in loaded)
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy": heavy}}))
+"""
+
+
+def _probe(stmt: str, warmup: List[str]) -> Dict[str, Any]:
+    code = PROBE.format(stmt=stmt, warmup=warmup, heavy=HEAVY_MODULES)
+    env = dict(os.environ, PYTHONPATH=str(DAGS_DIR))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=DAGS_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _bench(label: str, stmt: str, warmup: List[str], budget_ms: float) -> bool:
+    results = [_probe(stmt, warmup) for _ in range(RUNS)]
+    median_ms = statistics.median(r["elapsed_ms"] for r in results)
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    ok = median_ms <= budget_ms and not heavy
+    status = "OK  " if ok else "FAIL"
+    print(
+        f"[{status}] {label}: median {median_ms:.1f} ms over {RUNS} runs "
+        f"(budget {budget_ms:.0f} ms)"
+    )
+    if heavy:
+        print(f"       heavy modules imported: {', '.join(heavy)}")
+    return ok
+
+
+def _airflow_available() -> bool:
+    try:
+        import airflow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main() -> None:
+    ok = _bench(
+        "import mbta_bunching.tasks",
+        "import mbta_bunching.tasks",
+        [],
+        TASKS_IMPORT_BUDGET_MS,
+    )
+
+    if _airflow_available():
+        load_dag = (
+            f"spec = importlib.util.spec_from_file_location('mbta_dag', {str(DAG_FILE)!r})\n"
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+        )
+        ok &= _bench(
+            f"parse {DAG_FILE.name}",
+            load_dag,
+            ["airflow", "airflow.operators.python"],
+            DAG_PARSE_BUDGET_MS,
+        )
+    else:
+        print(f"[SKIP] parse {DAG_FILE.name}: airflow is not installed")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
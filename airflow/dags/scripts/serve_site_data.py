@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Same layout assumptions as sync_site_data.py:
+# parents[0] = scripts, parents[1] = dags
+DAGS_DIR = Path(__file__).resolve().parents[1]
+GOLD_SCORES_DIR = DAGS_DIR / "data" / "gold" / "headway_scores"
+SILVER_DIR = DAGS_DIR / "data" / "silver" / "vehicles"
+SITE_DIR = DAGS_DIR / "site"
+
+HOST = os.getenv("SITE_SERVER_HOST", "0.0.0.0")
+PORT = int(os.getenv("SITE_SERVER_PORT", "8050"))
+POLL_SECONDS = float(os.getenv("SITE_SERVER_POLL_SECONDS", "5"))
+HEARTBEAT_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 8
+KEEPALIVE_SECONDS = 10.0
+# Small static files (app.js, map tiles) kept in memory, keyed on
+# (path, mtime, size) so a replaced file is never served stale.
+STATIC_CACHE_ENTRIES = 2048
+# Published tile pyramids live under data/tiles/<version>/ and never change.
+IMMUTABLE_PREFIX = "/data/tiles/"
+
+def _latest(pattern: str, src_dir: Path) -> Optional[Path]:
+    files = sorted(src_dir.glob(pattern))
+    if not files:
+        return None
+    return files[-1]
+
+
+def _snapshot_tag(path: Path) -> str:
+    """vehicles_20251209T130203Z.csv -> 20251209T130203Z"""
+    return path.stem.split("_")[-1]
+
+
+def _format_tag(tag: str) -> str:
+    """Render a snapshot tag the same way sync_site_data.py writes last_updated.txt."""
+    try:
+        dt = datetime.strptime(tag, "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return tag
+    return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+def _read_rows(body: bytes) -> List[Dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+
+
+def _normalise_direction(value: str) -> str:
+    """
+    "0.0" -> "0", so keys match app.js, where PapaParse has already typed
+    direction_id as a number.
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value or ""
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+def _score_key(row: Dict[str, str]) -> str:
+    route_id = (row.get("route_id") or "").strip()
+    return f"{route_id}|{_normalise_direction(row.get('direction_id', ''))}"
+
+
+def _stat_key(path: Path) -> Tuple[Path, int, int]:
+    st = path.stat()
+    return path, st.st_mtime_ns, st.st_size
+
+
+class SiteState:
+    """
+    Latest Gold scores + Silver vehicles held in memory, with pre-computed
+    ETags so every dashboard request is either a 304 or a single byte copy.
+    """
+
+    def __init__(self) -> None:
+        self.tag: Optional[str] = None
+        self.files: Dict[str, Tuple[bytes, str, str]] = {}
+        self.scores: Dict[str, Dict[str, str]] = {}
+        self._sources: Optional[Tuple[Tuple[Path, int, int], ...]] = None
+
+    def refresh(self) -> Optional[Dict[str, Any]]:
+        """
+        Reload from disk once a new snapshot has landed in both Gold and Silver.
+
+        Sources are keyed on (path, mtime, size) rather than path alone, so a
+        file that was still being written on one poll is re-read on the next.
+
+        Returns
+        -------
+        dict or None
+            The changed/removed route-direction scores against the previous
+            state, or None if nothing changed.
+        """
+        scores_src = _latest("headway_scores_*.csv", GOLD_SCORES_DIR)
+        vehicles_src = _latest("vehicles_*.csv", SILVER_DIR)
+        if scores_src is None or vehicles_src is None:
+            return None
+        tag = _snapshot_tag(scores_src)
+        if tag != _snapshot_tag(vehicles_src):
+            # Silver lands before Gold: wait for the matching scores so each
+            # snapshot is published as exactly one diff.
+            return None
+        sources = (_stat_key(scores_src), _stat_key(vehicles_src))
+        if sources == self._sources:
+            return None
+
+        scores_body = scores_src.read_bytes()
+        vehicles_body = vehicles_src.read_bytes()
+        if sources != (_stat_key(scores_src), _stat_key(vehicles_src)):
+            # Still being written; pick it up once it settles.
+            return None
+
+        updated_body = _format_tag(tag).encode("utf-8")
+
+        new_scores = {_score_key(r): r for r in _read_rows(scores_body)}
+
+        # Only scores are diffed: the dashboard renders route/direction
+        # summaries, and vehicle rows change on every snapshot anyway.
+        # vehicles_latest.csv is still served (with an ETag) for full reads.
+        diff = {
+            "tag": tag,
+            "last_updated": updated_body.decode("utf-8"),
+            "scores": {
+                "changed": [
+                    row
+                    for key, row in new_scores.items()
+                    if self.scores.get(key) != row
+                ],
+                "removed": [key for key in self.scores if key not in new_scores],
+            },
+        }
+
+        self.files = {
+            "headway_scores_latest.csv": (scores_body, _etag(scores_body), "text/csv"),
+            "vehicles_latest.csv": (vehicles_body, _etag(vehicles_body), "text/csv"),
+            "last_updated.txt": (updated_body, _etag(updated_body), "text/plain"),
+        }
+        self.scores = new_scores
+        self.tag = tag
+        self._sources = sources
+        return diff
+
+
+class Broadcaster:
+    """Fan one pre-encoded SSE message out to every connected dashboard."""
+
+    def __init__(self) -> None:
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, message: bytes) -> None:
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow client: drop it; EventSource reconnects and the
+                # "hello" event tells it to refetch the full CSVs.
+                self.unsubscribe(queue)
+
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> bytes:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+def _response(
+    status: str,
+    body: bytes = b"",
+    headers: Optional[Dict[str, str]] = None,
+    keep_alive: bool = False,
+) -> bytes:
+    head = [f"HTTP/1.1 {status}"]
+    all_headers = {
+        "Content-Length": str(len(body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    all_headers.update(headers or {})
+    head.extend(f"{k}: {v}" for k, v in all_headers.items())
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Tuple[str, str, Dict[str, str], bool]:
+    """Returns (method, path, headers, keep_alive); method is "" at EOF."""
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    headers: Dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    parts = request_line.split()
+    if len(parts) < 2:
+        return "", "", headers, False
+    connection = headers.get("connection", "").lower()
+    if len(parts) > 2 and parts[2] == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    return parts[0], parts[1].split("?", 1)[0], headers, keep_alive
+
+
+def _static_cache_control(path: str) -> str:
+    rest = path[len(IMMUTABLE_PREFIX):] if path.startswith(IMMUTABLE_PREFIX) else ""
+    if "/" in rest:
+        # data/tiles/<version>/...; only index.json (no version) changes.
+        return "public, max-age=31536000, immutable"
+    return "no-cache"
+
+
+class SiteServer:
+    def __init__(self) -> None:
+        self.state = SiteState()
+        self.broadcaster = Broadcaster()
+        self.static_cache: "OrderedDict[Tuple[Path, int, int], bytes]" = OrderedDict()
+
+    async def poll_forever(self) -> None:
+        """
+        Check for a new snapshot; compute its diff once and broadcast it.
+
+        This is also the initial load, so a file removed or half-written
+        while the DAG runs never stops the server from starting.
+        """
+        while True:
+            try:
+                diff = self.state.refresh()
+            except (OSError, KeyError, csv.Error) as e:
+                print(f"[site] refresh failed: {e}", file=sys.stderr)
+                diff = None
+            if diff is not None:
+                print(
+                    f"[site] snapshot {diff['tag']}: "
+                    f"{len(diff['scores']['changed'])} routes changed, "
+                    f"{len(diff['scores']['removed'])} removed, "
+                    f"{len(self.broadcaster.subscribers)} subscribers"
+                )
+                self.broadcaster.publish(_sse("diff", diff, diff["tag"]))
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Keep the connection open between requests so a map pan reuses it.
+        try:
+            while True:
+                try:
+                    method, path, headers, keep_alive = await asyncio.wait_for(
+                        _read_request(reader), KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if not method:
+                    break
+                if method not in ("GET", "HEAD"):
+                    writer.write(_response("405 Method Not Allowed"))
+                    keep_alive = False
+                elif path == "/events":
+                    await self._stream_events(writer)
+                    return
+                elif path.startswith("/data/") and path[len("/data/"):] in self.state.files:
+                    writer.write(
+                        self._serve_data(path[len("/data/"):], headers, method, keep_alive)
+                    )
+                else:
+                    # Map tiles and anything else sync_site_data.py copied
+                    # into site/data are served from disk.
+                    writer.write(await self._serve_static(path, headers, method, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _serve_data(
+        self, name: str, headers: Dict[str, str], method: str, keep_alive: bool
+    ) -> bytes:
+        body, etag, content_type = self.state.files[name]
+        common = {"ETag": etag, "Cache-Control": "no-cache"}
+        if headers.get("if-none-match") == etag:
+            return _response("304 Not Modified", headers=common, keep_alive=keep_alive)
+        common["Content-Type"] = f"{content_type}; charset=utf-8"
+        if method == "HEAD":
+            common["Content-Length"] = str(len(body))
+            return _response("200 OK", headers=common, keep_alive=keep_alive)
+        return _response("200 OK", body, common, keep_alive)
+
+    async def _read_static(self, key: Tuple[Path, int, int]) -> bytes:
+        body = self.static_cache.get(key)
+        if body is None:
+            body = await asyncio.to_thread(key[0].read_bytes)
+            self.static_cache[key] = body
+            if len(self.static_cache) > STATIC_CACHE_ENTRIES:
+                self.static_cache.popitem(last=False)
+        else:
+            self.static_cache.move_to_end(key)
+        return body
+
+    async def _serve_static(
+        self, path: str, headers: Dict[str, str], method: str, keep_alive: bool
+    ) -> bytes:
+        rel = "index.html" if path in ("", "/") else path.lstrip("/")
+        target = (SITE_DIR / rel).resolve()
+        if SITE_DIR.resolve() not in target.parents or not target.is_file():
+            return _response("404 Not Found", keep_alive=keep_alive)
+        key = _stat_key(target)
+        _, mtime_ns, size = key
+        etag = f'"{mtime_ns:x}-{size:x}"'
+        common = {
+            "ETag": etag,
+            "Last-Modified": formatdate(mtime_ns / 1e9, usegmt=True),
+            "Cache-Control": _static_cache_control(path),
+        }
+        if headers.get("if-none-match") == etag:
+            return _response("304 Not Modified", headers=common, keep_alive=keep_alive)
+        common["Content-Type"] = (
+            mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        )
+        if method == "HEAD":
+            common["Content-Length"] = str(size)
+            return _response("200 OK", headers=common, keep_alive=keep_alive)
+        body = await self._read_static(key)
+        return _response("200 OK", body, common, keep_alive)
+
+    async def _stream_events(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(_sse("hello", {"tag": self.state.tag}, self.state.tag))
+        queue = self.broadcaster.subscribe()
+        try:
+            await writer.drain()
+            while queue in self.broadcaster.subscribers:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    message = b": keep-alive\n\n"
+                writer.write(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.broadcaster.unsubscribe(queue)
+            writer.close()
+
+
+async def serve() -> None:
+    server = SiteServer()
+    tcp = await asyncio.start_server(server.handle, HOST, PORT)
+    print(f"[site] serving {SITE_DIR} on http://{HOST}:{PORT}")
+    async with tcp:
+        await asyncio.gather(tcp.serve_forever(), server.poll_forever())
+
+
+def main() -> None:
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
 import shutil
 import sys
 from datetime import datetime
+from typing import Optional
 
 def _latest(pattern: str, src_dir: Path) -> Path:
     files = sorted(src_dir.glob(pattern))
@@ -12,6 +15,47 @@ def _latest(pattern: str, src_dir: Path) -> Path:
     return files[-1]
 
 
+def _tiles_version(index_path: Path) -> Optional[str]:
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8")).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _sync_tiles(src: Path, dest: Path) -> int:
+    """
+    Mirror the published tile pyramid (see publish_tiles.py) into dest.
+
+    The version directory is copied under a temp name and renamed into place,
+    then index.json is replaced atomically. The previous version is kept for
+    clients that still hold the old index.
+    """
+    index_bytes = (src / "index.json").read_bytes()
+    version = json.loads(index_bytes).get("version")
+    if not version:
+        raise ValueError(f"{src / 'index.json'} has no version")
+
+    dest.mkdir(parents=True, exist_ok=True)
+    previous = _tiles_version(dest / "index.json")
+
+    if not (dest / version).exists():
+        staging = dest / f".{version}.tmp"
+        if staging.exists():
+            shutil.rmtree(staging)
+        shutil.copytree(src / version, staging)
+        os.rename(staging, dest / version)
+
+    tmp_index = dest / ".index.json.tmp"
+    tmp_index.write_bytes(index_bytes)
+    os.replace(tmp_index, dest / "index.json")
+
+    for old in dest.iterdir():
+        if old.is_dir() and not old.name.startswith(".") and old.name not in (version, previous):
+            shutil.rmtree(old, ignore_errors=True)
+
+    return sum(1 for _ in (dest / version).rglob("*.json"))
+
+
 def main() -> None:
     # This file is at: airflow/dags/scripts/sync_site_data.py
     # parents[0] = scripts
@@ -27,6 +71,7 @@ def main() -> None:
 
     gold_scores_dir = repo_root / "airflow" / "dags" / "data" / "gold" / "headway_scores"
     silver_dir = repo_root / "airflow" / "dags" / "data" / "silver" / "vehicles"
+    tiles_dir = repo_root / "airflow" / "dags" / "data" / "gold" / "tiles"
 
     site_data_dir = repo_root / "airflow" / "dags" / "site" / "data"
     site_data_dir.mkdir(parents=True, exist_ok=True)
@@ -61,6 +106,15 @@ def main() -> None:
     print(f"  scores   -> {scores_dest} (size={scores_dest.stat().st_size} bytes)")
     print(f"  vehicles -> {vehicles_dest} (size={vehicles_dest.stat().st_size} bytes)")
 
+    # Map tiles: copy the new version beside the live one, then swap index.json
+    # so the dashboard (or serve_site_data.py) never sees a partial tree.
+    tiles_dest = site_data_dir / "tiles"
+    if (tiles_dir / "index.json").exists():
+        n_tiles = _sync_tiles(tiles_dir, tiles_dest)
+        print(f"  tiles    -> {tiles_dest} ({n_tiles} tiles)")
+    else:
+        print(f"  tiles    -> skipped (no index.json in {tiles_dir})")
+
     timestamp_path = site_data_dir / "last_updated.txt"
     timestamp_path.write_text(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"))
     print(f"Updated timestamp → {timestamp_path}")
@@ -104,6 +104,8 @@ document.addEventListener("DOMContentLoaded", () => {
 
   loadLastUpdated();   // read last_updated.txt
   loadScoresCsv();     // load CSV and populate UI
+  subscribeLiveUpdates(); // SSE diffs when served by scripts/serve_site_data.py
+  initTileMap();       // bunching map from pre-aggregated tiles
 });
 
 /* ---------------------- CSV loading ---------------------- */
@@ -433,41 +435,266 @@ function loadLastUpdated() {
   const tsEl = document.getElementById("last-updated");
   if (!tsEl) return;
 
-  fetch("data/last_updated.txt", { cache: "no-store" })
+  fetch("data/last_updated.txt", { cache: "no-cache" })
     .then((res) => {
       if (!res.ok) {
         throw new Error("Failed to fetch last_updated.txt");
       }
       return res.text();
     })
-    .then((txt) => {
-      const raw = txt.trim();
-      if (!raw) {
-        tsEl.textContent = "Last updated: Unknown";
-        return;
-      }
-
-      const dt = new Date(raw);
-      if (isNaN(dt.getTime())) {
-        tsEl.textContent = `Last updated: ${raw}`;
-        return;
-      }
-
-      // Convert to EST/EDT using America/New_York
-      const formattedEST = new Intl.DateTimeFormat("en-US", {
-        timeZone: "America/New_York",
-        year: "numeric",
-        month: "2-digit",
-        day: "2-digit",
-        hour: "2-digit",
-        minute: "2-digit",
-        second: "2-digit",
-      }).format(dt);
-
-      tsEl.textContent = `Last updated: ${formattedEST} EST`;
-    })
+    .then((txt) => renderLastUpdated(txt))
     .catch((err) => {
       console.error("Error loading last_updated.txt:", err);
       tsEl.textContent = "Last updated: Unknown";
     });
-}
\ No newline at end of file
+}
+
+function renderLastUpdated(txt) {
+  const tsEl = document.getElementById("last-updated");
+  if (!tsEl) return;
+
+  const raw = String(txt || "").trim();
+  if (!raw) {
+    tsEl.textContent = "Last updated: Unknown";
+    return;
+  }
+
+  const dt = new Date(raw);
+  if (isNaN(dt.getTime())) {
+    tsEl.textContent = `Last updated: ${raw}`;
+    return;
+  }
+
+  // Convert to EST/EDT using America/New_York
+  const formattedEST = new Intl.DateTimeFormat("en-US", {
+    timeZone: "America/New_York",
+    year: "numeric",
+    month: "2-digit",
+    day: "2-digit",
+    hour: "2-digit",
+    minute: "2-digit",
+    second: "2-digit",
+  }).format(dt);
+
+  tsEl.textContent = `Last updated: ${formattedEST} EST`;
+}
+
+/* ---------------------- Live updates (SSE) ---------------------- */
+
+let CURRENT_TAG = null;
+
+// Mirror PapaParse's dynamicTyping for rows that arrive as JSON strings.
+function typeRow(row) {
+  const out = {};
+  for (const [k, v] of Object.entries(row)) {
+    out[k] = v !== "" && isFinite(Number(v)) ? Number(v) : v;
+  }
+  return out;
+}
+
+// Must match _score_key in scripts/serve_site_data.py ("8|0", not "8|0.0").
+function scoreKey(row) {
+  const dir = Number(row.direction_id);
+  const dirKey =
+    row.direction_id !== "" && isFinite(dir)
+      ? String(dir)
+      : String(row.direction_id ?? "");
+  return `${String(row.route_id).trim()}|${dirKey}`;
+}
+
+function applyScoresDiff(diff) {
+  const removed = new Set(diff.removed || []);
+  const byKey = new Map();
+  for (const row of HEADWAY_SCORES) {
+    if (!removed.has(scoreKey(row))) byKey.set(scoreKey(row), row);
+  }
+  for (const raw of diff.changed || []) {
+    const row = typeRow(raw);
+    byKey.set(scoreKey(row), row);
+  }
+  const routesBefore = HEADWAY_SCORES.map(scoreKey).sort().join(",");
+  HEADWAY_SCORES = Array.from(byKey.values());
+  const routesAfter = HEADWAY_SCORES.map(scoreKey).sort().join(",");
+
+  // New or removed route/directions: rebuild the pickers, keeping the
+  // rider's current selection if it still exists.
+  if (routesBefore !== routesAfter) {
+    refreshRouteSelect();
+  }
+
+  // Re-render the summary if the rider is looking at a route right now.
+  const card = document.getElementById("summary-card");
+  if (card && !card.classList.contains("hidden")) {
+    handleAnalyzeClick();
+  }
+}
+
+function refreshRouteSelect() {
+  const routeSelect = document.getElementById("route-select");
+  const dirSelect = document.getElementById("direction-select");
+  const analyzeBtn = document.getElementById("analyze-btn");
+  if (!routeSelect || !dirSelect || !analyzeBtn) return;
+
+  const routeId = routeSelect.value;
+  const dirId = dirSelect.value;
+
+  populateRouteSelect();
+
+  if (!routeId || !routeSelect.querySelector(`option[value="${CSS.escape(routeId)}"]`)) {
+    return;
+  }
+  routeSelect.value = routeId;
+  handleRouteChange();
+
+  if (dirId && dirSelect.querySelector(`option[value="${CSS.escape(dirId)}"]`)) {
+    dirSelect.value = dirId;
+    handleDirectionChange();
+  }
+}
+
+function subscribeLiveUpdates() {
+  // Only available when the site is served by scripts/serve_site_data.py;
+  // on a plain static host the stream 404s and we stay on reload-to-refresh.
+  if (typeof EventSource === "undefined") return;
+
+  const source = new EventSource("events");
+
+  source.addEventListener("hello", (ev) => {
+    const { tag } = JSON.parse(ev.data);
+    // Reconnected after missing diffs: refetch (cheap 304 if unchanged).
+    if (CURRENT_TAG !== null && tag !== CURRENT_TAG) {
+      loadLastUpdated();
+      loadScoresCsv();
+    }
+    CURRENT_TAG = tag;
+  });
+
+  source.addEventListener("diff", (ev) => {
+    const diff = JSON.parse(ev.data);
+    CURRENT_TAG = diff.tag;
+    renderLastUpdated(diff.last_updated);
+    applyScoresDiff(diff.scores || {});
+  });
+
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      console.info("Live updates unavailable; reload to refresh.");
+    }
+  };
+}
+
+/* ---------------------- Bunching map (tiles) ---------------------- */
+
+const TILE_CACHE = new Map();
+
+function fetchTile(version, z, x, y) {
+  // Each published pyramid lives under its own version, so tile URLs never
+  // change content and the browser can cache them.
+  const key = `${version}/${z}/${x}/${y}`;
+  if (!TILE_CACHE.has(key)) {
+    TILE_CACHE.set(
+      key,
+      fetch(`data/tiles/${key}.json`).then((res) => (res.ok ? res.json() : null))
+    );
+  }
+  return TILE_CACHE.get(key);
+}
+
+function bunchingColor(share, alpha) {
+  // green (no bunching) -> amber -> red (every bus bunched)
+  const hue = Math.round(120 * (1 - Math.min(1, Math.max(0, share))));
+  return `hsla(${hue}, 85%, 50%, ${alpha})`;
+}
+
+function initTileMap() {
+  const card = document.getElementById("map-card");
+  const el = document.getElementById("tile-map");
+  if (!card || !el || typeof L === "undefined") return;
+
+  fetch("data/tiles/index.json", { cache: "no-cache" })
+    .then((res) => {
+      if (!res.ok) throw new Error("No tiles published yet");
+      return res.json();
+    })
+    .then((index) => {
+      card.classList.remove("hidden");
+
+      // Only request tiles that exist; empty areas never hit the network.
+      const available = {};
+      for (const [z, keys] of Object.entries(index.tiles || {})) {
+        available[z] = new Set(keys);
+      }
+      const cellsPerSide = 1 << index.cell_bits;
+
+      const map = L.map(el).setView([42.35, -71.08], 12);
+      L.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png", {
+        maxZoom: 18,
+        attribution: "&copy; OpenStreetMap contributors",
+      }).addTo(map);
+
+      const BunchingLayer = L.GridLayer.extend({
+        createTile(coords, done) {
+          const tile = document.createElement("canvas");
+          const size = this.getTileSize();
+          tile.width = size.x;
+          tile.height = size.y;
+
+          if (!available[coords.z]?.has(`${coords.x}/${coords.y}`)) {
+            setTimeout(() => done(null, tile), 0);
+            return tile;
+          }
+
+          fetchTile(index.version, coords.z, coords.x, coords.y)
+            .then((data) => {
+              if (!data) return;
+              const ctx = tile.getContext("2d");
+              const cw = size.x / cellsPerSide;
+              const ch = size.y / cellsPerSide;
+              for (const [cx, cy, vehicles, events] of data.cells) {
+                const alpha = Math.min(0.85, 0.25 + 0.1 * vehicles);
+                ctx.fillStyle = bunchingColor(events / vehicles, alpha);
+                ctx.fillRect(cx * cw, cy * ch, cw, ch);
+              }
+            })
+            .catch((err) => console.error("Tile error:", err))
+            .finally(() => done(null, tile));
+          return tile;
+        },
+      });
+
+      const layer = new BunchingLayer({
+        minNativeZoom: index.min_zoom,
+        maxNativeZoom: index.max_zoom,
+      }).addTo(map);
+
+      map.on("click", (ev) => {
+        const z = Math.min(index.max_zoom, Math.max(index.min_zoom, map.getZoom()));
+        const p = map.project(ev.latlng, z).divideBy(layer.getTileSize().x).floor();
+        if (!available[z]?.has(`${p.x}/${p.y}`)) return;
+
+        fetchTile(index.version, z, p.x, p.y).then((data) => {
+          if (!data) return;
+          const rows = Object.entries(data.routes)
+            .sort((a, b) => b[1].bunching_events - a[1].bunching_events)
+            .slice(0, 8)
+            .map(
+              ([route, r]) =>
+                `<tr><td>${route}</td><td>${r.vehicles}</td><td>${r.bunching_events}</td>` +
+                `<td>${r.mean_spacing_stops === null ? "–" : r.mean_spacing_stops.toFixed(1)}</td></tr>`
+            )
+            .join("");
+          L.popup()
+            .setLatLng(ev.latlng)
+            .setContent(
+              `<b>${data.vehicles} bus positions, ${data.bunching_events} bunched</b>` +
+                `<div>over ${index.snapshots} snapshot${index.snapshots === 1 ? "" : "s"}</div>` +
+                `<table><tr><th>Route</th><th>Buses</th><th>Bunched</th><th>Stops apart</th></tr>${rows}</table>`
+            )
+            .openOn(map);
+        });
+      });
+    })
+    .catch(() => {
+      // No tiles yet (or map library unavailable): leave the map hidden.
+    });
+}
@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+# Tests import the DAG package the same way Airflow does: from the dags folder.
+DAGS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(DAGS_DIR))
+
+SILVER_HEADER = (
+    "vehicle_id,route_id,trip_id,stop_id,direction_id,current_status,"
+    "current_stop_sequence,label,latitude,longitude,speed,bearing,updated_at"
+)
+
+
+@pytest.fixture
+def sample_silver() -> Path:
+    """The Silver snapshot committed under data/."""
+    return DAGS_DIR / "data" / "silver" / "vehicles" / "vehicles_20251209T130203Z.csv"
+
+
+@pytest.fixture
+def write_silver() -> Callable[[Path, List[str]], Path]:
+    """Write a Silver CSV from data lines (SILVER_HEADER is prepended)."""
+
+    def _write(path: Path, lines: List[str]) -> Path:
+        path.write_text("\n".join([SILVER_HEADER, *lines]) + "\n", encoding="utf-8")
+        return path
+
+    return _write
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import List
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("polars")
+
+from mbta_bunching.headway_engines import ENGINES
+
+
+def _silver_lines(rows: List[tuple]) -> List[str]:
+    """rows: (route_id, direction_id, trip_id, current_stop_sequence, updated_at)"""
+    return [
+        f"v{i},{route},{trip},s{i},{direction},IN_TRANSIT_TO,{seq},{i},42.3,-71.0,,,{ts}"
+        for i, (route, direction, trip, seq, ts) in enumerate(rows)
+    ]
+
+
+def _random_rows(rng: random.Random, day: int, fractional: str) -> List[tuple]:
+    rows = []
+    for _ in range(rng.randint(20, 60)):
+        second = rng.randint(0, 3599)
+        ts = f"2025-12-{day:02d} 13:{second // 60:02d}:{second % 60:02d}"
+        if fractional == "us" and rng.random() < 0.5:
+            ts += f".{rng.randint(0, 999999):06d}"
+        elif fractional == "ns" and rng.random() < 0.5:
+            ts += f".{rng.randint(0, 999999999):09d}"
+        rows.append(
+            (
+                rng.choice(["1", "15", "SL1"]),
+                rng.choice(["0.0", "1.0", ""]) if rng.random() < 0.1 else rng.choice(["0", "1"]),
+                rng.choice(["71467471", "BL-75565530", "3000"]),
+                rng.choice(["", "3", "12"]),
+                ts + "+00:00",
+            )
+        )
+    return rows
+
+
+def _assert_engines_match(tmp_path: Path, silver_paths: List[Path]) -> None:
+    outputs = {}
+    for name, compute in ENGINES.items():
+        gaps_path = tmp_path / f"gaps_{name}.csv"
+        scores_path = tmp_path / f"scores_{name}.csv"
+        compute(silver_paths, gaps_path, scores_path)
+        outputs[name] = (gaps_path.read_bytes(), scores_path.read_bytes())
+
+    reference = outputs.pop("pandas")
+    for name, (gaps, scores) in outputs.items():
+        assert gaps == reference[0], f"{name} gaps differ from pandas"
+        assert scores == reference[1], f"{name} scores differ from pandas"
+
+
+def test_engines_match_on_sample_snapshot(tmp_path, sample_silver):
+    _assert_engines_match(tmp_path, [sample_silver])
+
+
+def test_engines_match_without_null_direction(tmp_path, write_silver):
+    rows = [
+        ("1", "0", "t1", "1", "2025-12-09 13:00:00+00:00"),
+        ("1", "0", "t2", "2", "2025-12-09 13:04:00+00:00"),
+        ("1", "1", "t3", "1", "2025-12-09 13:05:00+00:00"),
+        ("1", "1", "t4", "2", "2025-12-09 13:09:30+00:00"),
+    ]
+    path = write_silver(tmp_path / "vehicles_a.csv", _silver_lines(rows))
+    _assert_engines_match(tmp_path, [path])
+
+
+@pytest.mark.parametrize("fractional", ["us", "ns"])
+@pytest.mark.parametrize("seed", range(10))
+def test_engines_match_with_fractional_seconds(tmp_path, write_silver, seed, fractional):
+    rng = random.Random(seed)
+    rows = _random_rows(rng, 9, fractional)
+    path = write_silver(tmp_path / "vehicles_a.csv", _silver_lines(rows))
+    _assert_engines_match(tmp_path, [path])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_engines_match_on_multi_file_mixed_formats(tmp_path, write_silver, seed):
+    rng = random.Random(seed)
+    paths = [
+        write_silver(
+            tmp_path / f"vehicles_{day}.csv",
+            _silver_lines(_random_rows(rng, day, fractional)),
+        )
+        for day, fractional in [(8, ""), (9, "us"), (10, "")]
+    ]
+    # Bronze-style offsets as well as the Silver "+00:00" rendering.
+    text = paths[2].read_text().replace("2025-12-10 13:", "2025-12-10T08:").replace("+00:00", "-05:00")
+    paths[2].write_text(text)
+    _assert_engines_match(tmp_path, paths)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from mbta_bunching import publish_tiles
+from mbta_bunching.publish_tiles import (
+    _positions_with_spacing,
+    build_tile_pyramid,
+    snapshot_partial,
+)
+
+
+def _tiles_at(tiles_dir: Path, index: dict, zoom: int) -> list:
+    return [
+        json.loads((tiles_dir / str(zoom) / f"{key}.json").read_text(encoding="utf-8"))
+        for key in index["tiles"][str(zoom)]
+    ]
+
+
+def test_sample_snapshot_is_not_all_bunched(sample_silver: Path) -> None:
+    df = _positions_with_spacing(sample_silver)
+
+    assert (df["spacing_stops"].dropna() >= 0).all()
+    # A realistic snapshot has some bunching, nowhere near every bus.
+    assert 0 < df["bunched"].mean() < 0.5
+
+
+def test_spacing_is_per_route_direction_along_stop_sequence(
+    tmp_path: Path, write_silver
+) -> None:
+    silver = write_silver(
+        tmp_path / "vehicles_20251209T130203Z.csv",
+        [
+            # route 1 outbound: stops 3, 4 (bunched), 12
+            "a,1,t1,s,0.0,IN_TRANSIT_TO,12.0,a,42.30,-71.00,,,2025-12-09 13:00:00+00:00",
+            "b,1,t2,s,0.0,IN_TRANSIT_TO,3.0,b,42.31,-71.01,,,2025-12-09 12:40:00+00:00",
+            "c,1,t3,s,0.0,IN_TRANSIT_TO,4.0,c,42.32,-71.02,,,2025-12-09 13:01:00+00:00",
+            # no position: dropped from the map, but still spaces its neighbours
+            "d,1,t4,s,1.0,IN_TRANSIT_TO,20.0,d,,,,,2025-12-09 13:00:00+00:00",
+            "e,1,t5,s,1.0,IN_TRANSIT_TO,30.0,e,42.33,-71.03,,,2025-12-09 13:00:00+00:00",
+            # no direction: counted, never bunched
+            "f,1,t6,s,,IN_TRANSIT_TO,,f,42.34,-71.04,,,2025-12-09 13:00:00+00:00",
+        ],
+    )
+
+    df = _positions_with_spacing(silver).set_index(["latitude", "longitude"])
+
+    assert df["spacing_stops"].to_dict() == pytest.approx(
+        {
+            (42.30, -71.00): 8.0,
+            (42.31, -71.01): float("nan"),
+            (42.32, -71.02): 1.0,
+            (42.33, -71.03): 10.0,
+            (42.34, -71.04): float("nan"),
+        },
+        nan_ok=True,
+    )
+    assert df["bunched"].sum() == 1
+
+    partial = tmp_path / "tile_partial_20251209T130203Z.csv"
+    snapshot_partial(silver).to_csv(partial, index=False)
+    index = build_tile_pyramid([partial], tmp_path / "tiles")
+    tiles = _tiles_at(tmp_path / "tiles", index, index["min_zoom"])
+    assert sum(t["vehicles"] for t in tiles) == 5
+    assert sum(t["bunching_events"] for t in tiles) == 1
+    assert all(
+        r["mean_spacing_stops"] is None or r["mean_spacing_stops"] > 0
+        for t in tiles
+        for r in t["routes"].values()
+    )
+
+
+def test_tiles_accumulate_across_snapshots(tmp_path: Path, monkeypatch, write_silver) -> None:
+    silver_dir = tmp_path / "silver"
+    silver_dir.mkdir()
+    monkeypatch.setattr(publish_tiles, "SILVER_DIR", silver_dir)
+    monkeypatch.setattr(publish_tiles, "TILES_DIR", tmp_path / "tiles")
+    monkeypatch.setattr(publish_tiles, "HISTORY_DIR", tmp_path / "history")
+
+    def run(tag: str, lines: list) -> dict:
+        # The pipeline keeps only the latest Silver file.
+        for old in silver_dir.glob("*.csv"):
+            old.unlink()
+        write_silver(silver_dir / f"vehicles_{tag}.csv", lines)
+        index_path = Path(publish_tiles.publish_tiles_from_latest_silver())
+        return json.loads(index_path.read_text(encoding="utf-8"))
+
+    first = run(
+        "20251209T130203Z",
+        [
+            "a,1,t1,s,0.0,IN_TRANSIT_TO,3.0,a,42.30,-71.00,,,2025-12-09 13:00:00+00:00",
+            "b,1,t2,s,0.0,IN_TRANSIT_TO,4.0,b,42.30,-71.00,,,2025-12-09 13:00:00+00:00",
+        ],
+    )
+    second = run(
+        "20251209T131703Z",
+        [
+            "a,1,t1,s,0.0,IN_TRANSIT_TO,10.0,a,42.30,-71.00,,,2025-12-09 13:15:00+00:00",
+            "b,1,t2,s,0.0,IN_TRANSIT_TO,4.0,b,42.30,-71.00,,,2025-12-09 13:15:00+00:00",
+            "c,7,t3,s,1.0,IN_TRANSIT_TO,2.0,c,42.30,-71.00,,,2025-12-09 13:15:00+00:00",
+        ],
+    )
+
+    assert second["snapshots"] == 2
+    assert second["first_tag"] == "20251209T130203Z"
+    assert second["version"] == "20251209T131703Z"
+    # The previous version stays readable for clients holding the old index.
+    assert (tmp_path / "tiles" / first["version"]).is_dir()
+
+    zoom = second["max_zoom"]
+    (tile,) = _tiles_at(tmp_path / "tiles" / second["version"], second, zoom)
+    assert tile["vehicles"] == 5
+    assert tile["bunching_events"] == 1
+    # Route 1: spacings 1 then 6 stops, averaged from the summed partials.
+    assert tile["routes"]["1"] == {
+        "vehicles": 4,
+        "bunching_events": 1,
+        "mean_spacing_stops": 3.5,
+    }
+    assert tile["routes"]["7"]["mean_spacing_stops"] is None
+    assert sum(c[2] for c in tile["cells"]) == 5
+
+    third = run(
+        "20251209T133203Z",
+        ["a,1,t1,s,0.0,IN_TRANSIT_TO,3.0,a,42.30,-71.00,,,2025-12-09 13:30:00+00:00"],
+    )
+    assert third["snapshots"] == 3
+    versions = sorted(p.name for p in (tmp_path / "tiles").iterdir() if p.is_dir())
+    assert versions == [second["version"], third["version"]]